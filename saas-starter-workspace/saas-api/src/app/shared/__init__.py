@@ -1,5 +1,6 @@
 """Shared utilities across layers."""
 
+from .http_cache import NOT_MODIFIED_RESPONSE, CachedJSONResponder, etag_matches
 from .result import Result
 
-__all__ = ["Result"]
\ No newline at end of file
+__all__ = ["NOT_MODIFIED_RESPONSE", "CachedJSONResponder", "Result", "etag_matches"]
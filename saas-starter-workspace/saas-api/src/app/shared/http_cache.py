@@ -0,0 +1,79 @@
+"""Short-lived JSON response caching with ETag revalidation."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import Any, Callable
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+# OpenAPI entry for routes that answer conditional requests through ``CachedJSONResponder``.
+NOT_MODIFIED_RESPONSE: dict[int | str, dict[str, Any]] = {
+    status.HTTP_304_NOT_MODIFIED: {
+        "description": "Payload unchanged since the supplied ETag"
+    },
+}
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return whether an ``If-None-Match`` header value matches ``etag``.
+
+    Uses the weak comparison RFC 9110 requires for ``If-None-Match``, so a tag that a
+    proxy rewrote as ``W/"..."`` still matches.
+    """
+
+    if not if_none_match:
+        return False
+    target = _opaque_tag(etag)
+    return any(
+        tag in ("*", target) for tag in map(_opaque_tag, if_none_match.split(","))
+    )
+
+
+class CachedJSONResponder:
+    """Encode a JSON payload at most once per ``max_age`` seconds and serve it with an ETag.
+
+    Health routes use a short window so orchestrator liveness probes still observe
+    fresh state; matching ``If-None-Match`` requests are answered with a 304.
+    """
+
+    __slots__ = (
+        "_build_payload",
+        "_max_age",
+        "_cache_control",
+        "_expires_at",
+        "_body",
+        "_etag",
+    )
+
+    def __init__(self, build_payload: Callable[[], Any], *, max_age: int = 5) -> None:
+        self._build_payload = build_payload
+        self._max_age = max_age
+        self._cache_control = f"public, max-age={max_age}"
+        self._expires_at = 0.0
+        self._body = b""
+        self._etag = ""
+
+    def respond(self, request: Request) -> Response:
+        now = time.monotonic()
+        if now >= self._expires_at:
+            payload = jsonable_encoder(self._build_payload())
+            self._body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            self._etag = f'"{hashlib.sha1(self._body).hexdigest()}"'
+            self._expires_at = now + self._max_age
+
+        headers = {"ETag": self._etag, "Cache-Control": self._cache_control}
+        if etag_matches(request.headers.get("if-none-match"), self._etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(self._body, media_type="application/json", headers=headers)
+
+
+__all__ = ["NOT_MODIFIED_RESPONSE", "CachedJSONResponder", "etag_matches"]
@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import importlib.util
+import inspect
 import os
 import sys
-from functools import lru_cache
+from functools import cache, lru_cache
 from pathlib import Path
-from types import ModuleType
-from typing import Any, Optional
+from types import MappingProxyType, ModuleType
+from typing import Any, Callable, Mapping, Optional
 
 _VENDOR_MODULE = "cors"
 _VENDOR_VERSION = "0.1.9"
@@ -18,7 +19,35 @@ _CACHE_PREFIX = "rapidkit_vendor_cors"
 
 DEFAULT_HEALTH_PREFIX = "/api/health/module/cors"
 
+try:
+    from fastapi import APIRouter, FastAPI  # type: ignore
+    from fastapi.responses import ORJSONResponse  # type: ignore
+except ImportError:  # pragma: no cover - FastAPI optional for template rendering
+    APIRouter = None  # type: ignore[assignment,misc]
+    FastAPI = None  # type: ignore[assignment,misc]
+    ORJSONResponse = None  # type: ignore[assignment,misc]
+
+# Shared payload templates for the health endpoint; warnings use an empty tuple
+# so the templates stay immutable (it serializes the same as an empty list).
+_HEALTH_DEFAULTS: Mapping[str, Any] = MappingProxyType(
+    {"module": _VENDOR_MODULE, "status": "ok", "warnings": ()}
+)
+_UNKNOWN_PAYLOAD: Mapping[str, Any] = MappingProxyType(
+    {
+        "module": _VENDOR_MODULE,
+        "status": "unknown",
+        "detail": "runtime not initialized",
+        "warnings": (),
+    }
+)
+
+_VENDOR: Optional[ModuleType] = None
+_BOOTSTRAPPED_BASE: Optional[str] = None
+_PROXY_MARKER = "__rapidkit_proxy__"
+_BOUND_ATTRS: set[str] = set()
 
+
+@cache
 def _project_root() -> Path:
     current = Path(__file__).resolve()
     for ancestor in current.parents:
@@ -33,14 +62,23 @@ def _ensure_proxy_package(name: str, path: Path) -> None:
     if not path.exists():
         return
 
+    location = str(path)
     original = sys.modules.get(name)
+    if original is not None and (
+        getattr(original, _PROXY_MARKER, None) == location
+        or getattr(original, "__path__", None) == [location]
+    ):
+        return
+
     proxy = ModuleType(name)
     if original is not None:
         proxy.__dict__.update(original.__dict__)
-    proxy.__path__ = [str(path)]
+    proxy.__path__ = [location]
+    setattr(proxy, _PROXY_MARKER, location)
     sys.modules[name] = proxy
 
 
+@cache
 def _vendor_module_root() -> Optional[Path]:
     """Locate the vendor module root containing <name>.py + types/ directory."""
 
@@ -49,24 +87,29 @@ def _vendor_module_root() -> Optional[Path]:
         return None
 
     module_name = _VENDOR_MODULE.split("/")[-1]
-    for candidate in base.rglob(f"{module_name}.py"):
-        if candidate.name != f"{module_name}.py":
-            continue
-        if candidate.parent.name != module_name:
-            continue
-        return candidate.parent
+    filename = f"{module_name}.py"
+    # Only <name>/<name>.py qualifies, so probe for that pair per directory
+    # instead of matching every file in the vendor tree.
+    for root, dirs, _files in os.walk(base):
+        if module_name in dirs:
+            candidate = Path(root) / module_name
+            if (candidate / filename).is_file():
+                return candidate
+        dirs[:] = [d for d in dirs if not d.startswith(("_", "."))]
     return None
 
 
 def _ensure_vendor_namespaces() -> None:
     module_root = _vendor_module_root()
+    namespaces = [("health", _vendor_base_dir() / "src" / "health")]
     if module_root is not None:
-        _ensure_proxy_package("database", module_root)
-        _ensure_proxy_package("types", module_root / "types")
+        namespaces[:0] = [("database", module_root), ("types", module_root / "types")]
 
-    _ensure_proxy_package("health", _vendor_base_dir() / "src" / "health")
+    for name, path in namespaces:
+        _ensure_proxy_package(name, path)
 
 
+@cache
 def _vendor_root() -> Path:
     override = os.getenv(_VENDOR_ROOT_ENV)
     if override:
@@ -74,17 +117,22 @@ def _vendor_root() -> Path:
     return _project_root() / ".rapidkit" / "vendor"
 
 
+@cache
 def _vendor_base_dir() -> Path:
     root = _vendor_root()
     module_dir = root / _VENDOR_MODULE
     preferred = module_dir / _VENDOR_VERSION if _VENDOR_VERSION else None
     if preferred and preferred.exists():
         return preferred
-    candidates = sorted(
-        (path for path in module_dir.glob("*") if path.is_dir()), reverse=True
-    )
-    if candidates:
-        return candidates[0]
+    latest = None
+    if module_dir.is_dir():
+        with os.scandir(module_dir) as entries:
+            latest = max(
+                (entry.name for entry in entries if entry.is_dir(follow_symlinks=False)),
+                default=None,
+            )
+    if latest is not None:
+        return module_dir / latest
     raise RuntimeError(
         "RapidKit vendor payload for '{module}' not found under {root}. Re-run `rapidkit modules install {module}`.".format(
             module=_VENDOR_MODULE,
@@ -93,6 +141,7 @@ def _vendor_base_dir() -> Path:
     )
 
 
+@cache
 def _vendor_file() -> Path:
     if not _VENDOR_RELATIVE_PATH:
         raise RuntimeError(
@@ -103,6 +152,20 @@ def _vendor_file() -> Path:
     return _vendor_base_dir() / _VENDOR_RELATIVE_PATH
 
 
+def _bootstrap_vendor_paths() -> None:
+    """Install namespace proxies and the sys.path entry once per vendor base dir."""
+
+    global _BOOTSTRAPPED_BASE
+    vendor_base = str(_vendor_base_dir())
+    if _BOOTSTRAPPED_BASE == vendor_base:
+        return
+
+    _ensure_vendor_namespaces()
+    if vendor_base not in sys.path:
+        sys.path.insert(0, vendor_base)
+    _BOOTSTRAPPED_BASE = vendor_base
+
+
 @lru_cache(maxsize=1)
 def _load_vendor_module() -> ModuleType:
     vendor_path = _vendor_file()
@@ -114,11 +177,7 @@ def _load_vendor_module() -> ModuleType:
             )
         )
 
-    _ensure_vendor_namespaces()
-
-    vendor_base = str(_vendor_base_dir())
-    if vendor_base not in sys.path:
-        sys.path.insert(0, vendor_base)
+    _bootstrap_vendor_paths()
 
     module_name = _CACHE_PREFIX + _VENDOR_MODULE.replace("/", "_") + "_health"
     spec = importlib.util.spec_from_file_location(module_name, vendor_path)
@@ -128,6 +187,9 @@ def _load_vendor_module() -> ModuleType:
     module = importlib.util.module_from_spec(spec)
     sys.modules.setdefault(module_name, module)
     spec.loader.exec_module(module)
+
+    global _VENDOR
+    _VENDOR = module
     return module
 
 
@@ -145,9 +207,42 @@ def _resolve_export(name: str) -> Any:
 
 
 def refresh_vendor_module() -> None:
-    """Clear import caches after vendor upgrades."""
+    """Clear import and path-discovery caches after vendor upgrades."""
+
+    global _VENDOR
+    _VENDOR = None
+    namespace = globals()
+    for name in _BOUND_ATTRS:
+        namespace.pop(name, None)
+    _BOUND_ATTRS.clear()
 
     _load_vendor_module.cache_clear()
+    _build_health_router.cache_clear()
+    _vendor_file.cache_clear()
+    _vendor_module_root.cache_clear()
+    _vendor_base_dir.cache_clear()
+    _vendor_root.cache_clear()
+    _project_root.cache_clear()
+
+
+def _resolve_health_probe() -> Optional[Callable[[], Any]]:
+    """Return the first callable health probe exported by the vendor runtime."""
+
+    try:
+        vendor = _VENDOR or _load_vendor_module()
+    except Exception:
+        return None
+
+    for probe_name in (
+        "check_health",
+        "health_check",
+        "module_health_status",
+        f"{_VENDOR_MODULE}_health_check",
+    ):
+        probe = getattr(vendor, probe_name, None)
+        if callable(probe):
+            return probe
+    return None
 
 
 def build_health_router(prefix: str = DEFAULT_HEALTH_PREFIX) -> Any:
@@ -157,65 +252,52 @@ def build_health_router(prefix: str = DEFAULT_HEALTH_PREFIX) -> Any:
     - prefix: /api/health/module/<slug>
     - method/path: GET ""
     - tag: ["health"]
+
+    Routers are memoized per prefix, so callers share one instance and must
+    not mutate it after construction. While the vendor runtime fails to load,
+    a fresh router is returned that retries probe resolution per request.
     """
 
     try:
-        from fastapi import APIRouter  # type: ignore
-    except ImportError:  # pragma: no cover - FastAPI optional for template rendering
-        APIRouter = None  # type: ignore[assignment]
+        _VENDOR or _load_vendor_module()
+    except Exception:
+        return _create_health_router(prefix, resolve_per_request=True)
 
-    if APIRouter is not None:
-        router = APIRouter(prefix=prefix, tags=["health"])
+    # Always key the cache positionally so keyword and default calls share an entry.
+    return _build_health_router(prefix)
 
-        async def _build_health_payload() -> dict[str, Any]:
-            probe_names = (
-                "check_health",
-                "health_check",
-                "module_health_status",
-                f"{_VENDOR_MODULE}_health_check",
-            )
 
-            for probe_name in probe_names:
-                try:
-                    probe = _resolve_export(probe_name)
-                except Exception:
-                    probe = None
+@cache
+def _build_health_router(prefix: str) -> Any:
+    return _create_health_router(prefix, resolve_per_request=False)
+
+
+def _create_health_router(prefix: str, *, resolve_per_request: bool) -> Any:
+    if APIRouter is not None:
+        router = APIRouter(
+            prefix=prefix,
+            tags=["health"],
+            default_response_class=ORJSONResponse,
+        )
 
-                if not callable(probe):
-                    continue
+        resolved_probe = None if resolve_per_request else _resolve_health_probe()
 
+        async def _build_health_payload() -> dict[str, Any]:
+            probe = _resolve_health_probe() if resolve_per_request else resolved_probe
+            if probe is not None:
                 try:
                     result = probe()
-                    if hasattr(result, "__await__"):
+                    if inspect.isawaitable(result):
                         result = await result
                 except Exception as exc:
-                    return {
-                        "module": _VENDOR_MODULE,
-                        "status": "error",
-                        "detail": str(exc),
-                        "warnings": [],
-                    }
+                    return {**_HEALTH_DEFAULTS, "status": "error", "detail": str(exc)}
 
                 if isinstance(result, dict):
-                    payload = dict(result)
-                    payload.setdefault("module", _VENDOR_MODULE)
-                    payload.setdefault("status", "ok")
-                    payload.setdefault("warnings", [])
-                    return payload
-
-                return {
-                    "module": _VENDOR_MODULE,
-                    "status": "ok",
-                    "detail": str(result),
-                    "warnings": [],
-                }
-
-            return {
-                "module": _VENDOR_MODULE,
-                "status": "unknown",
-                "detail": "runtime not initialized",
-                "warnings": [],
-            }
+                    return {**_HEALTH_DEFAULTS, **result}
+
+                return {**_HEALTH_DEFAULTS, "detail": str(result)}
+
+            return dict(_UNKNOWN_PAYLOAD)
 
         @router.get("", summary=f"{_VENDOR_MODULE} health check")
         async def read_health() -> dict[str, Any]:
@@ -241,11 +323,6 @@ def create_health_router(prefix: str = DEFAULT_HEALTH_PREFIX) -> Any:
 
 
 def _fallback_register(app: Any) -> None:
-    try:
-        from fastapi import FastAPI  # type: ignore
-    except ImportError:  # pragma: no cover - FastAPI optional for template rendering
-        FastAPI = None  # type: ignore[assignment]
-
     if FastAPI is not None and not isinstance(app, FastAPI):
         raise TypeError(
             "register_cors_health expects a FastAPI application instance"
@@ -255,34 +332,22 @@ def _fallback_register(app: Any) -> None:
     app.include_router(router)
 
 
-try:
-    register_cors_health = _resolve_export("register_cors_health")
-except Exception:
-    register_cors_health = _fallback_register
-
-
-try:
-    router = build_health_router()
-except Exception:  # pragma: no cover - allow non-router health runtimes
-    router = None
+def _lazy_register_cors_health() -> Any:
+    try:
+        return _resolve_export("register_cors_health")
+    except Exception:
+        return _fallback_register
 
 
-def __getattr__(item: str) -> Any:
-    vendor = _load_vendor_module()
+def _lazy_router() -> Any:
     try:
-        return getattr(vendor, item)
-    except AttributeError as exc:  # pragma: no cover - propagate helpful error
-        raise AttributeError(item) from exc
-
+        return build_health_router()
+    except Exception:  # pragma: no cover - allow non-router health runtimes
+        return None
 
-try:
-    _vendor_exports = set(getattr(_load_vendor_module(), "__all__", []))
-except Exception:
-    _vendor_exports = set()
 
-__all__ = sorted(
-    _vendor_exports
-    | {
+_SHIM_EXPORTS = frozenset(
+    {
         "build_health_router",
         "create_health_router",
         "refresh_vendor_module",
@@ -290,3 +355,37 @@ __all__ = sorted(
         "router",
     }
 )
+
+
+def _lazy_all() -> list[str]:
+    try:
+        vendor_exports = set(getattr(_load_vendor_module(), "__all__", []))
+    except Exception:
+        vendor_exports = set()
+    return sorted(vendor_exports | _SHIM_EXPORTS)
+
+
+# Resolved on first access (PEP 562) so importing the shim does not load the
+# vendor runtime or build routers.
+_LAZY_EXPORTS: dict[str, Callable[[], Any]] = {
+    "__all__": _lazy_all,
+    "register_cors_health": _lazy_register_cors_health,
+    "router": _lazy_router,
+}
+
+
+def __getattr__(item: str) -> Any:
+    factory = _LAZY_EXPORTS.get(item)
+    if factory is not None:
+        value = factory()
+    else:
+        vendor = _VENDOR or _load_vendor_module()
+        try:
+            value = getattr(vendor, item)
+        except AttributeError as exc:  # pragma: no cover - propagate helpful error
+            raise AttributeError(item) from exc
+
+    # Bind the export as a real module global so later lookups skip __getattr__.
+    globals()[item] = value
+    _BOUND_ATTRS.add(item)
+    return value
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from typing import Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
+
+from src.app.shared.http_cache import NOT_MODIFIED_RESPONSE, CachedJSONResponder
 
 from ..stripe_payment import StripePayment
 
@@ -12,10 +14,16 @@ from ..stripe_payment import StripePayment
 def build_router() -> APIRouter:
     router = APIRouter(prefix="/stripe-payment", tags=["Stripe Payment"])
     facade = StripePayment()
-
-    @router.get("/health", summary="Stripe Payment health check")
-    async def read_health() -> dict[str, Any]:
-        return facade.health_check()
+    health = CachedJSONResponder(facade.health_check)
+
+    @router.get(
+        "/health",
+        summary="Stripe Payment health check",
+        response_model=dict[str, Any],
+        responses=NOT_MODIFIED_RESPONSE,
+    )
+    async def read_health(request: Request) -> Response:
+        return health.respond(request)
 
     @router.get("/metadata", summary="Stripe Payment metadata snapshot")
     async def read_metadata() -> dict[str, Any]:
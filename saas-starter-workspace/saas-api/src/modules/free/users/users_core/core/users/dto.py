@@ -27,6 +27,12 @@ class UserDTO(BaseModel):
 	def from_entity(cls, entity: User) -> "UserDTO":
 		return cls.model_validate(entity.model_dump())
 
+	@classmethod
+	def from_entity_fast(cls, entity: User) -> "UserDTO":
+		"""Build a DTO from an already-validated entity without re-running validation."""
+
+		return cls.model_construct(**dict(entity))
+
 
 class UserCreateDTO(BaseModel):
 	"""Incoming payload for creating a user."""
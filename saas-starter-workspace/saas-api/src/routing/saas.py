@@ -2,18 +2,22 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any
+from email.utils import formatdate
+from functools import lru_cache
+from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from pydantic import BaseModel, EmailStr, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, TypeAdapter
 
 from src.modules.free.auth.core.auth.core import AuthCoreRuntime
 from src.modules.free.auth.core.auth.dependencies import get_auth_core_runtime
 from src.modules.free.auth.oauth.oauth import OAuthRuntime
 from src.modules.free.auth.oauth.oauth import get_runtime as get_oauth_runtime
-from src.modules.free.auth.session.session import SessionRuntime
+from src.modules.free.auth.session.session import SessionEnvelope, SessionRuntime
 from src.modules.free.auth.session.session import get_runtime as get_session_runtime
 from src.modules.free.security.rate_limiting.dependencies import rate_limit_dependency
 from src.modules.free.users.users_core.core.users.dependencies import get_users_service
@@ -38,27 +42,57 @@ from src.modules.free.users.users_profiles.core.users.profiles.service import (
     UserProfileServiceFacade,
 )
 
-router = APIRouter(tags=["saas-api"])
+router = APIRouter(tags=["saas-api"], default_response_class=ORJSONResponse)
+
+_DEFAULT_SCOPES: tuple[str, ...] = ("user:read", "user:write", "billing:read", "team:write")
+_UTC = timezone.utc
+_BEARER_PREFIX = "bearer "
+_BEARER_PREFIX_LEN = len(_BEARER_PREFIX)
+_USER_DTO_ADAPTER: TypeAdapter[UserDTO] = TypeAdapter(UserDTO)
+
+
+# Request emails only need a structural check here; UserCreateDTO still runs full
+# EmailStr validation before anything is persisted.
+_EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+def _check_email(value: str) -> str:
+    if _EMAIL_PATTERN.fullmatch(value) is None:
+        raise ValueError("value is not a valid email address")
+    return value
+
+
+EmailAddress = Annotated[str, AfterValidator(_check_email)]
+
+_REQUEST_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True)
 
 
 class RegisterRequest(BaseModel):
-    email: EmailStr
+    model_config = _REQUEST_MODEL_CONFIG
+
+    email: EmailAddress
     password: str = Field(min_length=8, max_length=200)
     full_name: str | None = Field(default=None, max_length=200)
 
 
 class LoginRequest(BaseModel):
-    email: EmailStr
+    model_config = _REQUEST_MODEL_CONFIG
+
+    email: EmailAddress
     password: str = Field(min_length=8, max_length=200)
 
 
 class OAuthCallbackRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     state: str = Field(min_length=8)
-    email: EmailStr | None = None
+    email: EmailAddress | None = None
     full_name: str | None = Field(default=None, max_length=200)
 
 
 class PaymentMethodRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     type: str = Field(default="card", max_length=40)
     provider: str = Field(default="stripe", max_length=40)
     last4: str = Field(min_length=4, max_length=4)
@@ -67,45 +101,53 @@ class PaymentMethodRequest(BaseModel):
 
 
 class TeamCreateRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     name: str = Field(min_length=2, max_length=120)
 
 
 class CheckoutRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     plan_id: str = Field(min_length=2, max_length=60)
 
 
 @dataclass(slots=True)
 class InMemoryBillingStore:
     plans: list[dict[str, Any]]
+    plans_by_id: dict[str, dict[str, Any]]
     subscriptions_by_user: dict[str, dict[str, Any]]
     payment_methods_by_user: dict[str, list[dict[str, Any]]]
     teams_by_user: dict[str, list[dict[str, Any]]]
 
 
+_PLANS: list[dict[str, Any]] = [
+    {
+        "id": "starter",
+        "name": "Starter",
+        "price_monthly": 19,
+        "currency": "usd",
+        "features": ["1 workspace", "5 members", "Email support"],
+    },
+    {
+        "id": "growth",
+        "name": "Growth",
+        "price_monthly": 79,
+        "currency": "usd",
+        "features": ["10 workspaces", "25 members", "Priority support"],
+    },
+    {
+        "id": "scale",
+        "name": "Scale",
+        "price_monthly": 249,
+        "currency": "usd",
+        "features": ["Unlimited workspaces", "Unlimited members", "SLA + SSO"],
+    },
+]
+
 _STORE = InMemoryBillingStore(
-    plans=[
-        {
-            "id": "starter",
-            "name": "Starter",
-            "price_monthly": 19,
-            "currency": "usd",
-            "features": ["1 workspace", "5 members", "Email support"],
-        },
-        {
-            "id": "growth",
-            "name": "Growth",
-            "price_monthly": 79,
-            "currency": "usd",
-            "features": ["10 workspaces", "25 members", "Priority support"],
-        },
-        {
-            "id": "scale",
-            "name": "Scale",
-            "price_monthly": 249,
-            "currency": "usd",
-            "features": ["Unlimited workspaces", "Unlimited members", "SLA + SSO"],
-        },
-    ],
+    plans=_PLANS,
+    plans_by_id={plan["id"]: plan for plan in _PLANS},
     subscriptions_by_user={},
     payment_methods_by_user={},
     teams_by_user={},
@@ -113,7 +155,23 @@ _STORE = InMemoryBillingStore(
 
 
 def _utcnow_iso() -> str:
-    return datetime.now(tz=timezone.utc).isoformat()
+    return datetime.now(tz=_UTC).isoformat()
+
+
+def _dump_user(user: UserDTO) -> dict[str, Any]:
+    return _USER_DTO_ADAPTER.dump_python(user, mode="json")
+
+
+def _auth_response(
+    user_json: dict[str, Any], access_token: str, session_envelope: SessionEnvelope
+) -> dict[str, Any]:
+    return {
+        "user": user_json,
+        "access_token": access_token,
+        "token_type": "bearer",
+        "session_id": session_envelope.session.session_id,
+        "refresh_token": session_envelope.refresh_token,
+    }
 
 
 def _get_session_runtime() -> SessionRuntime:
@@ -126,35 +184,54 @@ def _get_session_runtime() -> SessionRuntime:
         ) from exc
 
 
+@lru_cache(maxsize=8)
+def _session_cookie_template(
+    name: str, domain: str | None, secure: bool, httponly: bool, same_site: str
+) -> tuple[str, str]:
+    """Return the invariant Set-Cookie text around ``<token>; expires=<date>``."""
+
+    suffix = ""
+    if domain:
+        suffix += f"; Domain={domain}"
+    if httponly:
+        suffix += "; HttpOnly"
+    suffix += "; Path=/"
+    if same_site:
+        suffix += f"; SameSite={same_site}"
+    if secure:
+        suffix += "; Secure"
+    return f"{name}=", suffix
+
+
 def _set_session_cookie(response: Response, runtime: SessionRuntime, token: str, expires_at: float) -> None:
     cookie = runtime.settings.cookie
-    response.set_cookie(
-        key=cookie.name,
-        value=token,
-        domain=cookie.domain,
-        secure=cookie.secure,
-        httponly=cookie.httponly,
-        samesite=cookie.same_site,
-        expires=int(expires_at),
+    prefix, suffix = _session_cookie_template(
+        cookie.name, cookie.domain, cookie.secure, cookie.httponly, cookie.same_site
+    )
+    response.headers.append(
+        "set-cookie", f"{prefix}{token}; expires={formatdate(expires_at, usegmt=True)}{suffix}"
     )
 
 
-async def _get_current_user(
+async def current_user(
     request: Request,
-    users_service: UsersService,
-    auth_runtime: AuthCoreRuntime,
-    session_runtime: SessionRuntime,
+    users_service: UsersService = Depends(get_users_service),
+    auth_runtime: AuthCoreRuntime = Depends(get_auth_core_runtime),
+    session_runtime: SessionRuntime = Depends(_get_session_runtime),
 ) -> UserDTO:
+    """Resolve the authenticated user once per request (bearer token or session cookie)."""
+
     user_id: str | None = None
     auth_header = request.headers.get("authorization")
 
-    if auth_header and auth_header.lower().startswith("bearer "):
-        bearer_token = auth_header.split(" ", 1)[1]
+    if auth_header is not None and auth_header[:_BEARER_PREFIX_LEN].lower() == _BEARER_PREFIX:
+        bearer_token = auth_header[_BEARER_PREFIX_LEN:].strip()
         try:
             payload = auth_runtime.verify_token(bearer_token)
-            user_id = str(payload.get("sub", ""))
         except ValueError as exc:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
+        # Tokens are issued by auth_runtime.issue_token, whose subject is already a str.
+        user_id = payload.get("sub")
     else:
         session_token = request.cookies.get(session_runtime.settings.cookie.name)
         if not session_token:
@@ -172,7 +249,7 @@ async def _get_current_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid auth context")
 
     try:
-        return UserDTO.from_entity(await users_service.get_user(user_id))
+        return UserDTO.from_entity_fast(await users_service.get_user(user_id))
     except UserNotFoundError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
 
@@ -202,25 +279,21 @@ async def register(
     except UserEmailConflictError as exc:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
 
+    user_json = _dump_user(UserDTO.from_entity_fast(user))
+    uid, email = user_json["id"], user_json["email"]
     session_runtime = _get_session_runtime()
     access_token = auth_runtime.issue_token(
-        str(user.id),
-        scopes=["user:read", "user:write", "billing:read", "team:write"],
-        custom_claims={"email": str(user.email)},
+        uid,
+        scopes=_DEFAULT_SCOPES,
+        custom_claims={"email": email},
     )
     session_envelope = session_runtime.issue_session(
-        str(user.id),
-        payload={"email": str(user.email), "auth_method": "password"},
+        uid,
+        payload={"email": email, "auth_method": "password"},
     )
     _set_session_cookie(response, session_runtime, session_envelope.token, session_envelope.session.expires_at)
 
-    return {
-        "user": UserDTO.from_entity(user).model_dump(mode="json"),
-        "access_token": access_token,
-        "token_type": "bearer",
-        "session_id": session_envelope.session.session_id,
-        "refresh_token": session_envelope.refresh_token,
-    }
+    return _auth_response(user_json, access_token, session_envelope)
 
 
 @router.post("/auth/login")
@@ -240,25 +313,21 @@ async def login(
     if not password_hash or not auth_runtime.verify_password(payload.password, password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    user_json = _dump_user(UserDTO.from_entity_fast(user))
+    uid, email = user_json["id"], user_json["email"]
     session_runtime = _get_session_runtime()
     access_token = auth_runtime.issue_token(
-        str(user.id),
-        scopes=["user:read", "user:write", "billing:read", "team:write"],
-        custom_claims={"email": str(user.email)},
+        uid,
+        scopes=_DEFAULT_SCOPES,
+        custom_claims={"email": email},
     )
     session_envelope = session_runtime.issue_session(
-        str(user.id),
-        payload={"email": str(user.email), "auth_method": "password"},
+        uid,
+        payload={"email": email, "auth_method": "password"},
     )
     _set_session_cookie(response, session_runtime, session_envelope.token, session_envelope.session.expires_at)
 
-    return {
-        "user": UserDTO.from_entity(user).model_dump(mode="json"),
-        "access_token": access_token,
-        "token_type": "bearer",
-        "session_id": session_envelope.session.session_id,
-        "refresh_token": session_envelope.refresh_token,
-    }
+    return _auth_response(user_json, access_token, session_envelope)
 
 
 @router.get("/auth/oauth/{provider}", status_code=status.HTTP_307_TEMPORARY_REDIRECT)
@@ -302,7 +371,7 @@ async def oauth_callback(
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    resolved_email = payload.email or EmailStr(f"{provider}_{payload.state[:10]}@oauth.local")
+    resolved_email = payload.email or f"{provider}_{payload.state[:10]}@oauth.local"
 
     try:
         user = await users_service.get_user_by_email(resolved_email)
@@ -316,48 +385,35 @@ async def oauth_callback(
             )
         )
 
+    user_json = _dump_user(UserDTO.from_entity_fast(user))
+    uid, email = user_json["id"], user_json["email"]
     session_runtime = _get_session_runtime()
     access_token = auth_runtime.issue_token(
-        str(user.id),
-        scopes=["user:read", "user:write", "billing:read", "team:write"],
-        custom_claims={"email": str(user.email), "provider": provider},
+        uid,
+        scopes=_DEFAULT_SCOPES,
+        custom_claims={"email": email, "provider": provider},
     )
     session_envelope = session_runtime.issue_session(
-        str(user.id),
-        payload={"email": str(user.email), "auth_method": f"oauth:{provider}"},
+        uid,
+        payload={"email": email, "auth_method": f"oauth:{provider}"},
     )
     _set_session_cookie(response, session_runtime, session_envelope.token, session_envelope.session.expires_at)
 
-    return {
-        "user": UserDTO.from_entity(user).model_dump(mode="json"),
-        "access_token": access_token,
-        "token_type": "bearer",
-        "session_id": session_envelope.session.session_id,
-        "refresh_token": session_envelope.refresh_token,
-        "provider": provider,
-    }
+    response_body = _auth_response(user_json, access_token, session_envelope)
+    response_body["provider"] = provider
+    return response_body
 
 
 @router.get("/auth/me")
-async def auth_me(
-    request: Request,
-    users_service: UsersService = Depends(get_users_service),
-    auth_runtime: AuthCoreRuntime = Depends(get_auth_core_runtime),
-) -> dict[str, Any]:
-    session_runtime = _get_session_runtime()
-    user = await _get_current_user(request, users_service, auth_runtime, session_runtime)
-    return {"user": user.model_dump(mode="json")}
+async def auth_me(user: UserDTO = Depends(current_user)) -> dict[str, Any]:
+    return {"user": _dump_user(user)}
 
 
 @router.get("/users/profile", response_model=UserProfileReadDTO)
 async def get_current_user_profile(
-    request: Request,
-    users_service: UsersService = Depends(get_users_service),
-    auth_runtime: AuthCoreRuntime = Depends(get_auth_core_runtime),
+    user: UserDTO = Depends(current_user),
     profile_facade: UserProfileServiceFacade = Depends(get_user_profile_service_facade),
 ) -> UserProfileReadDTO:
-    session_runtime = _get_session_runtime()
-    user = await _get_current_user(request, users_service, auth_runtime, session_runtime)
     try:
         return await profile_facade.get_profile(user.id)
     except ProfileNotFoundError as exc:
@@ -367,13 +423,9 @@ async def get_current_user_profile(
 @router.put("/users/profile", response_model=UserProfileReadDTO)
 async def upsert_current_user_profile(
     payload: UserProfileUpdateDTO,
-    request: Request,
-    users_service: UsersService = Depends(get_users_service),
-    auth_runtime: AuthCoreRuntime = Depends(get_auth_core_runtime),
+    user: UserDTO = Depends(current_user),
     profile_facade: UserProfileServiceFacade = Depends(get_user_profile_service_facade),
 ) -> UserProfileReadDTO:
-    session_runtime = _get_session_runtime()
-    user = await _get_current_user(request, users_service, auth_runtime, session_runtime)
     try:
         return await profile_facade.upsert_profile(user.id, payload)
     except ProfileValidationError as exc:
@@ -388,15 +440,10 @@ async def list_subscription_plans() -> dict[str, Any]:
 @router.post("/subscriptions/checkout", status_code=status.HTTP_201_CREATED)
 async def create_subscription_checkout(
     payload: CheckoutRequest,
-    request: Request,
-    users_service: UsersService = Depends(get_users_service),
-    auth_runtime: AuthCoreRuntime = Depends(get_auth_core_runtime),
     _: Any = Depends(rate_limit_dependency(rule="default", cost=1)),
+    user: UserDTO = Depends(current_user),
 ) -> dict[str, Any]:
-    session_runtime = _get_session_runtime()
-    user = await _get_current_user(request, users_service, auth_runtime, session_runtime)
-
-    selected_plan = next((plan for plan in _STORE.plans if plan["id"] == payload.plan_id), None)
+    selected_plan = _STORE.plans_by_id.get(payload.plan_id)
     if selected_plan is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
 
@@ -411,13 +458,7 @@ async def create_subscription_checkout(
 
 
 @router.get("/subscriptions/current")
-async def get_current_subscription(
-    request: Request,
-    users_service: UsersService = Depends(get_users_service),
-    auth_runtime: AuthCoreRuntime = Depends(get_auth_core_runtime),
-) -> dict[str, Any]:
-    session_runtime = _get_session_runtime()
-    user = await _get_current_user(request, users_service, auth_runtime, session_runtime)
+async def get_current_subscription(user: UserDTO = Depends(current_user)) -> dict[str, Any]:
     current = _STORE.subscriptions_by_user.get(user.id)
     if current is None:
         return {"subscription": None}
@@ -427,13 +468,9 @@ async def get_current_subscription(
 @router.post("/billing/payment-method", status_code=status.HTTP_201_CREATED)
 async def add_payment_method(
     payload: PaymentMethodRequest,
-    request: Request,
-    users_service: UsersService = Depends(get_users_service),
-    auth_runtime: AuthCoreRuntime = Depends(get_auth_core_runtime),
     _: Any = Depends(rate_limit_dependency(rule="default", cost=1)),
+    user: UserDTO = Depends(current_user),
 ) -> dict[str, Any]:
-    session_runtime = _get_session_runtime()
-    user = await _get_current_user(request, users_service, auth_runtime, session_runtime)
     methods = _STORE.payment_methods_by_user.setdefault(user.id, [])
     method = {
         "id": f"pm_{len(methods) + 1}",
@@ -449,27 +486,16 @@ async def add_payment_method(
 
 
 @router.get("/teams")
-async def list_teams(
-    request: Request,
-    users_service: UsersService = Depends(get_users_service),
-    auth_runtime: AuthCoreRuntime = Depends(get_auth_core_runtime),
-) -> dict[str, Any]:
-    session_runtime = _get_session_runtime()
-    user = await _get_current_user(request, users_service, auth_runtime, session_runtime)
+async def list_teams(user: UserDTO = Depends(current_user)) -> dict[str, Any]:
     return {"teams": _STORE.teams_by_user.get(user.id, [])}
 
 
 @router.post("/teams", status_code=status.HTTP_201_CREATED)
 async def create_team(
     payload: TeamCreateRequest,
-    request: Request,
-    users_service: UsersService = Depends(get_users_service),
-    auth_runtime: AuthCoreRuntime = Depends(get_auth_core_runtime),
     _: Any = Depends(rate_limit_dependency(rule="default", cost=1)),
+    user: UserDTO = Depends(current_user),
 ) -> dict[str, Any]:
-    session_runtime = _get_session_runtime()
-    user = await _get_current_user(request, users_service, auth_runtime, session_runtime)
-
     bucket = _STORE.teams_by_user.setdefault(user.id, [])
     team = {
         "id": f"team_{len(bucket) + 1}",
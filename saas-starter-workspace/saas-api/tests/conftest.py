@@ -0,0 +1,58 @@
+"""Shared fixtures for the SaaS starter API tests."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+_DEV_ENVIRONMENT = {
+    "RAPIDKIT_SESSION_SECRET": "rapidkit-dev-session-secret",
+    "RAPIDKIT_AUTH_CORE_PEPPER": "rapidkit-dev-auth-pepper",
+    "GOOGLE_OAUTH_CLIENT_ID": "dev-google-client-id",
+    "GOOGLE_OAUTH_CLIENT_SECRET": "dev-google-client-secret",
+    "GITHUB_OAUTH_CLIENT_ID": "dev-github-client-id",
+    "GITHUB_OAUTH_CLIENT_SECRET": "dev-github-client-secret",
+}
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Provide development secrets before any test imports ``src.main``."""
+
+    for name, value in _DEV_ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client() -> AsyncIterator[AsyncClient]:
+    """Run the application lifespan once and share an in-process client across tests."""
+
+    from src.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as test_client:
+            yield test_client
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def authed(client: AsyncClient) -> dict[str, Any]:
+    """Register a fresh user and return the auth bundle from ``/api/auth/register``."""
+
+    response = await client.post(
+        "/api/auth/register",
+        json={
+            "email": f"founder-{uuid4().hex[:12]}@example.com",
+            "password": "StrongPass1234",
+            "full_name": "SaaS Founder",
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
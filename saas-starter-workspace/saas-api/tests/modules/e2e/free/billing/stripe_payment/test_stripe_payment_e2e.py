@@ -32,3 +32,29 @@ def test_router_builds_without_crashing() -> None:
             return
 
     assert getattr(router, "routes", None) is not None
+
+
+def test_health_supports_conditional_requests() -> None:
+    fastapi = pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    router_module = importlib.import_module(
+        "src.modules.free.billing.stripe_payment.routers.stripe_payment"
+    )
+    app = fastapi.FastAPI()
+    app.include_router(router_module.build_router())
+    client = TestClient(app)
+
+    first = client.get("/stripe-payment/health")
+    assert first.status_code == 200
+    assert first.json()["module"] == "stripe_payment"
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "public, max-age=5"
+
+    cached = client.get("/stripe-payment/health", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    responses = app.openapi()["paths"]["/stripe-payment/health"]["get"]["responses"]
+    assert responses["200"]["content"]["application/json"]["schema"]["type"] == "object"
+    assert "304" in responses
@@ -32,3 +32,29 @@ def test_router_builds_without_crashing() -> None:
             return
 
     assert getattr(router, "routes", None) is not None
+
+
+def test_health_supports_conditional_requests() -> None:
+    fastapi = pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    # The shim loads the vendor runtime, whose router serves the mounted health route.
+    shim = importlib.import_module("src.health.users_core")
+    health_module = shim._load_vendor_module()
+    app = fastapi.FastAPI()
+    app.include_router(health_module.build_health_router())
+    client = TestClient(app)
+    path = health_module.DEFAULT_HEALTH_PREFIX
+
+    first = client.get(path)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, max-age=5"
+    etag = first.headers["etag"]
+
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    weak = client.get(path, headers={"If-None-Match": f'"stale", W/{etag}'})
+    assert weak.status_code == 304
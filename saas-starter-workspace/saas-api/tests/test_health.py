@@ -14,4 +14,38 @@ def test_health_endpoint() -> None:
     assert payload["status"] == "ok"
     assert "version" in payload
     assert "uptime" in payload
-    assert "module" in payload
\ No newline at end of file
+    assert "module" in payload
+
+
+def test_cors_health_router_is_shared_across_call_styles() -> None:
+    from src.health import cors
+
+    router = cors.build_health_router()
+    assert cors.build_health_router(cors.DEFAULT_HEALTH_PREFIX) is router
+    assert cors.build_health_router(prefix=cors.DEFAULT_HEALTH_PREFIX) is router
+    assert cors.create_health_router() is router
+
+
+def test_cors_health_retries_vendor_load_and_awaits_probe_results(monkeypatch) -> None:
+    from functools import partial
+
+    from fastapi import FastAPI
+
+    from src.health import cors
+
+    def _missing_vendor() -> None:
+        raise RuntimeError("vendor missing")
+
+    monkeypatch.setattr(cors, "_VENDOR", None)
+    monkeypatch.setattr(cors, "_load_vendor_module", _missing_vendor)
+    health_app = FastAPI()
+    health_app.include_router(cors.build_health_router())
+    health_client = TestClient(health_app)
+    assert health_client.get(cors.DEFAULT_HEALTH_PREFIX).json()["status"] == "unknown"
+
+    async def _probe(status: str) -> dict[str, str]:
+        return {"status": status}
+
+    vendor = type("Vendor", (), {"check_health": staticmethod(partial(_probe, "ok"))})()
+    monkeypatch.setattr(cors, "_VENDOR", vendor)
+    assert health_client.get(cors.DEFAULT_HEALTH_PREFIX).json()["status"] == "ok"
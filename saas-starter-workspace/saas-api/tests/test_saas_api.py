@@ -2,70 +2,53 @@
 
 from __future__ import annotations
 
-import os
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
 from urllib.parse import parse_qs, urlparse
 
-from fastapi.testclient import TestClient
+import pytest
+from httpx import AsyncClient
 
-os.environ.setdefault("RAPIDKIT_SESSION_SECRET", "rapidkit-dev-session-secret")
-os.environ.setdefault("RAPIDKIT_AUTH_CORE_PEPPER", "rapidkit-dev-auth-pepper")
-os.environ.setdefault("GOOGLE_OAUTH_CLIENT_ID", "dev-google-client-id")
-os.environ.setdefault("GOOGLE_OAUTH_CLIENT_SECRET", "dev-google-client-secret")
-os.environ.setdefault("GITHUB_OAUTH_CLIENT_ID", "dev-github-client-id")
-os.environ.setdefault("GITHUB_OAUTH_CLIENT_SECRET", "dev-github-client-secret")
-
-from src.main import app
-
-client = TestClient(app)
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
 def _auth_headers(token: str) -> dict[str, str]:
     return {"Authorization": f"Bearer {token}"}
 
 
-def test_saas_primary_endpoints_flow() -> None:
-    register_payload = {
-        "email": "founder@example.com",
-        "password": "StrongPass1234",
-        "full_name": "SaaS Founder",
-    }
-    register = client.post("/api/auth/register", json=register_payload)
-    assert register.status_code == 201, register.text
-    auth_bundle = register.json()
-    token = auth_bundle["access_token"]
+async def test_saas_primary_endpoints_flow(client: AsyncClient, authed: dict[str, Any]) -> None:
+    headers = _auth_headers(authed["access_token"])
 
-    me = client.get("/api/auth/me", headers=_auth_headers(token))
-    assert me.status_code == 200, me.text
-    assert me.json()["user"]["email"] == register_payload["email"]
-
-    profile_update = client.put(
+    profile_update = await client.put(
         "/api/users/profile",
         json={"display_name": "Founder", "timezone": "UTC", "biography": "Building SaaS"},
-        headers=_auth_headers(token),
+        headers=headers,
     )
     assert profile_update.status_code == 200, profile_update.text
 
-    profile_get = client.get("/api/users/profile", headers=_auth_headers(token))
+    me, profile_get, plans = await asyncio.gather(
+        client.get("/api/auth/me", headers=headers),
+        client.get("/api/users/profile", headers=headers),
+        client.get("/api/subscriptions/plans", headers=headers),
+    )
+    assert me.status_code == 200, me.text
+    assert me.json()["user"]["email"] == authed["user"]["email"]
     assert profile_get.status_code == 200, profile_get.text
     assert profile_get.json()["display_name"] == "Founder"
-
-    plans = client.get("/api/subscriptions/plans", headers=_auth_headers(token))
     assert plans.status_code == 200, plans.text
     assert len(plans.json()["plans"]) >= 1
 
-    checkout = client.post(
+    checkout = await client.post(
         "/api/subscriptions/checkout",
         json={"plan_id": "growth"},
-        headers=_auth_headers(token),
+        headers=headers,
     )
     assert checkout.status_code == 201, checkout.text
     assert checkout.json()["checkout"]["status"] == "active"
 
-    current_subscription = client.get("/api/subscriptions/current", headers=_auth_headers(token))
-    assert current_subscription.status_code == 200, current_subscription.text
-    assert current_subscription.json()["subscription"]["plan"]["id"] == "growth"
-
-    payment_method = client.post(
+    payment_method = await client.post(
         "/api/billing/payment-method",
         json={
             "type": "card",
@@ -74,27 +57,32 @@ def test_saas_primary_endpoints_flow() -> None:
             "exp_month": 12,
             "exp_year": 2030,
         },
-        headers=_auth_headers(token),
+        headers=headers,
     )
     assert payment_method.status_code == 201, payment_method.text
     assert payment_method.json()["payment_method"]["last4"] == "4242"
 
-    create_team = client.post("/api/teams", json={"name": "Core Team"}, headers=_auth_headers(token))
+    create_team = await client.post("/api/teams", json={"name": "Core Team"}, headers=headers)
     assert create_team.status_code == 201, create_team.text
 
-    teams = client.get("/api/teams", headers=_auth_headers(token))
+    current_subscription, teams = await asyncio.gather(
+        client.get("/api/subscriptions/current", headers=headers),
+        client.get("/api/teams", headers=headers),
+    )
+    assert current_subscription.status_code == 200, current_subscription.text
+    assert current_subscription.json()["subscription"]["plan"]["id"] == "growth"
     assert teams.status_code == 200, teams.text
     assert teams.json()["teams"][0]["name"] == "Core Team"
 
 
-def test_oauth_authorize_and_callback_flow() -> None:
-    authorize = client.get("/api/auth/oauth/google", follow_redirects=False)
+async def test_oauth_authorize_and_callback_flow(client: AsyncClient) -> None:
+    authorize = await client.get("/api/auth/oauth/google", follow_redirects=False)
     assert authorize.status_code == 307, authorize.text
 
     redirect_location = authorize.headers["location"]
     state = parse_qs(urlparse(redirect_location).query)["state"][0]
 
-    callback = client.post(
+    callback = await client.post(
         "/api/auth/oauth/google/callback",
         json={
             "state": state,
@@ -106,3 +94,33 @@ def test_oauth_authorize_and_callback_flow() -> None:
     payload = callback.json()
     assert payload["provider"] == "google"
     assert payload["user"]["email"] == "oauth-user@example.com"
+
+
+async def test_auth_requests_reject_malformed_email_and_unknown_fields(client: AsyncClient) -> None:
+    bad_email = await client.post(
+        "/api/auth/login",
+        json={"email": "not-an-email", "password": "StrongPass1234"},
+    )
+    assert bad_email.status_code == 422, bad_email.text
+
+    unknown_field = await client.post(
+        "/api/auth/login",
+        json={"email": "founder@example.com", "password": "StrongPass1234", "role": "admin"},
+    )
+    assert unknown_field.status_code == 422, unknown_field.text
+
+
+async def test_register_sets_session_cookie_with_absolute_expiry(client: AsyncClient) -> None:
+    register = await client.post(
+        "/api/auth/register",
+        json={"email": "cookie@example.com", "password": "StrongPass1234", "full_name": "Cookie"},
+    )
+    assert register.status_code == 201, register.text
+
+    cookie = register.headers["set-cookie"]
+    assert cookie.startswith("rapidkit_session=")
+    assert "HttpOnly" in cookie and "Path=/" in cookie and "SameSite=lax" in cookie
+
+    expires = parsedate_to_datetime(cookie.split("expires=", 1)[1].split(";", 1)[0])
+    remaining = expires - datetime.now(timezone.utc)
+    assert timedelta(0) < remaining <= timedelta(days=366)
@@ -28,6 +28,7 @@ else:
 
 
 from .routing import api_router
+from .routing.webhooks import close_event_log, restore_event_log
 
 
 @asynccontextmanager
@@ -35,12 +36,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Coordinate startup/shutdown hooks contributed by RapidKit modules."""
 
     _ = app  # ensure the app reference stays available for injected hooks
+    restore_event_log()
     # <<<inject:startup>>>
     try:
         yield
     finally:
         # <<<inject:shutdown>>>
-        pass
+        close_event_log()
 
 
 app = FastAPI(
@@ -2,41 +2,82 @@
 
 from __future__ import annotations
 
-from typing import Dict
+import asyncio
+import time
+import weakref
+from typing import Any, Dict
 
 from fastapi import APIRouter, FastAPI
 
 from src.health.celery import build_health_snapshot, render_health_snapshot
 from src.modules.free.tasks.celery.celery import MODULE_FEATURES, get_celery_metadata
 
-router = APIRouter(prefix="/tasks/celery", tags=["tasks", "celery"])
+_FEATURES_PAYLOAD: Dict[str, object] = {"features": list(MODULE_FEATURES)}
 
+# Task inventory only changes on deploy, so a short TTL absorbs bursts of identical probes.
+_METADATA_TTL_SECONDS = 10.0
+_metadata_cache: Dict[str, Any] = {"expires_at": 0.0, "payload": None}
+# One lock per event loop, created on first use, so the module never binds a lock to a
+# loop that may be gone (e.g. between TestClient instances or asyncio.run calls).
+_metadata_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+    weakref.WeakKeyDictionary()
+)
 
-@router.get("/metadata", response_model=Dict[str, object])
-async def get_celery_metadata() -> Dict[str, object]:
+
+def _metadata_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    lock = _metadata_locks.get(loop)
+    if lock is None:
+        lock = _metadata_locks[loop] = asyncio.Lock()
+    return lock
+
+
+async def read_celery_metadata() -> Dict[str, object]:
     """Expose the configured Celery metadata."""
 
-    metadata = get_celery_metadata(include_tasks=True)
-    snapshot = build_health_snapshot(metadata)
-    return render_health_snapshot(snapshot)
+    if time.monotonic() < _metadata_cache["expires_at"]:
+        return _metadata_cache["payload"]
+
+    async with _metadata_lock():
+        if time.monotonic() < _metadata_cache["expires_at"]:
+            return _metadata_cache["payload"]
+        metadata = get_celery_metadata(include_tasks=True)
+        snapshot = build_health_snapshot(metadata)
+        payload = render_health_snapshot(snapshot)
+        _metadata_cache.update(
+            expires_at=time.monotonic() + _METADATA_TTL_SECONDS, payload=payload
+        )
+        return payload
 
 
-@router.get("/features", response_model=Dict[str, object])
 async def list_celery_features() -> Dict[str, object]:
     """List capabilities advertised by the Celery module."""
 
-    return {"features": list(MODULE_FEATURES)}
+    return _FEATURES_PAYLOAD
+
+
+def build_router() -> APIRouter:
+    """Build the Celery router on demand so importing this module stays cheap."""
+
+    router = APIRouter(prefix="/tasks/celery", tags=["tasks", "celery"])
+    router.add_api_route(
+        "/metadata", read_celery_metadata, methods=["GET"], response_model=None
+    )
+    router.add_api_route(
+        "/features", list_celery_features, methods=["GET"], response_model=None
+    )
+    return router
 
 
 def register_celery_routes(app: FastAPI) -> None:
     """Attach the Celery metadata routes to a FastAPI application."""
 
-    app.include_router(router)
+    app.include_router(build_router())
 
 
 __all__ = [
-    "get_celery_metadata",
+    "build_router",
     "list_celery_features",
+    "read_celery_metadata",
     "register_celery_routes",
-    "router",
 ]
@@ -15,4 +15,7 @@ api_router = APIRouter()
 api_router.include_router(health_router, prefix="/health", tags=["health"])
 api_router.include_router(examples_router, prefix="/examples", tags=["examples"])
 api_router.include_router(webhooks_router, prefix="/webhooks", tags=["webhooks"])
-# <<<inject:router-mount>>>
\ No newline at end of file
+# <<<inject:router-mount>>>
+
+# Freeze the assembled route table; later mutation should happen on the app, not here.
+api_router.routes = tuple(api_router.routes)  # type: ignore[assignment]
@@ -5,12 +5,17 @@ from __future__ import annotations
 import hashlib
 import hmac
 import os
+import re
 import time
-from datetime import datetime, timezone
+from collections import OrderedDict
+from functools import cache, lru_cache
+from itertools import islice
 from typing import Any
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, status
-from pydantic import BaseModel, Field
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
 
 try:
     from src.modules.free.communication.notifications.core.notifications import (
@@ -21,8 +26,10 @@ except Exception:  # pragma: no cover - optional dependency fallback
     Notification = None  # type: ignore[assignment]
     NotificationManager = None  # type: ignore[assignment]
 
+_NOTIFY_ENABLED = Notification is not None and NotificationManager is not None
 
-router = APIRouter(tags=["webhooks"])
+
+router = APIRouter(tags=["webhooks"], default_response_class=ORJSONResponse)
 
 
 class StripeWebhookRequest(BaseModel):
@@ -47,50 +54,239 @@ class WebhookLogEntry(BaseModel):
     last_error: str | None = None
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    _cached_dump: dict[str, Any] | None = PrivateAttr(default=None)
+    # metadata["content_hash"] of the payload whose notification was last sent.
+    _dispatched_hash: str | None = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._cached_dump = None
+
+    def as_log_item(self) -> dict[str, Any]:
+        """Return the serialized entry, reusing it until a field is reassigned."""
+
+        if self._cached_dump is None:
+            self._cached_dump = self.model_dump()
+        return self._cached_dump
+
+
+class _BoundedEventLog(OrderedDict[str, WebhookLogEntry]):
+    """Insertion-ordered event log that evicts the oldest entries beyond ``max_size``."""
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__()
+        self.max_size = max(1, max_size)
+
+    def __setitem__(self, key: str, value: WebhookLogEntry) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.max_size:
+            self.popitem(last=False)
+
+
+_EVENTS = _BoundedEventLog(int(os.getenv("WEBHOOKS_LOG_MAX", "10000")))
+
+
+# Environment lookups are cached per process; call ``refresh_webhook_settings`` after
+# changing these variables at runtime.
+@cache
+def _webhook_secret() -> str:
+    return os.getenv("STRIPE_WEBHOOK_SECRET", "whsec_test")
+
+
+@cache
+def _max_retries() -> int:
+    return int(os.getenv("WEBHOOKS_MAX_RETRIES", "3"))
+
+
+@cache
+def _notify_email() -> str:
+    return os.getenv("WEBHOOKS_NOTIFY_EMAIL", "billing@example.com")
+
+
+@cache
+def _event_log_path() -> str | None:
+    return os.getenv("WEBHOOKS_EVENT_LOG") or None
+
+
+def refresh_webhook_settings() -> None:
+    """Drop cached webhook environment settings so the next request re-reads them."""
+
+    _webhook_secret.cache_clear()
+    _max_retries.cache_clear()
+    _notify_email.cache_clear()
+    _event_log_path.cache_clear()
+    close_event_log()
+
+
+class _JournalRecord(BaseModel):
+    """One ``WEBHOOKS_EVENT_LOG`` line: an entry snapshot plus its dispatch state."""
+
+    entry: WebhookLogEntry
+    dispatched_hash: str | None = None
+
+
+# (path, fd) of the open journal; the fd is -1 while no journal is open.
+_JOURNAL: list[Any] = [None, -1]
+
+
+def _event_log_fd(path: str) -> int:
+    if _JOURNAL[0] != path:
+        close_event_log()
+        _JOURNAL[:] = [path, os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)]
+    return _JOURNAL[1]
+
+
+def close_event_log() -> None:
+    """Close the journal descriptor; the next append reopens it."""
+
+    if _JOURNAL[0] is not None:
+        os.close(_JOURNAL[1])
+        _JOURNAL[:] = [None, -1]
+
+
+def _journal_line(entry: WebhookLogEntry) -> bytes:
+    record = _JournalRecord(entry=entry, dispatched_hash=entry._dispatched_hash)
+    return record.model_dump_json().encode("utf-8") + b"\n"
+
+
+def _log_append(entry: WebhookLogEntry) -> None:
+    """Append a snapshot of ``entry`` to the ``WEBHOOKS_EVENT_LOG`` journal, if configured."""
+
+    path = _event_log_path()
+    if path is None:
+        return
+    fd = _event_log_fd(path)
+    # os.write may write fewer bytes than asked; finish the line so no torn JSONL record is left.
+    pending = memoryview(_journal_line(entry))
+    while pending:
+        pending = pending[os.write(fd, pending) :]
+
+
+def load_event_log(path: str, events: _BoundedEventLog) -> None:
+    """Fold a journal into ``events``; the last snapshot per event wins, arrival order is kept.
+
+    The whole journal is folded before trimming to the newest ``events.max_size`` arrivals, so
+    a later snapshot never revives an event that a smaller bound would have evicted. Startup
+    compaction in :func:`restore_event_log` keeps the journal itself bounded.
+    """
+
+    folded: dict[str, WebhookLogEntry] = {}
+    try:
+        with open(path, "rb") as journal:
+            for line in journal:
+                try:
+                    record = _JournalRecord.model_validate_json(line)
+                except ValidationError:  # torn write from an interrupted process
+                    continue
+                entry = record.entry
+                entry._dispatched_hash = record.dispatched_hash
+                folded[entry.event_id] = entry
+    except FileNotFoundError:
+        return
+    newest = islice(folded.items(), max(0, len(folded) - events.max_size), None)
+    for event_id, entry in newest:
+        events[event_id] = entry
+
+
+def restore_event_log() -> None:
+    """Load the configured journal into the event log and compact it to that projection.
 
-_EVENTS: dict[str, WebhookLogEntry] = {}
+    Called from the application lifespan; a no-op when ``WEBHOOKS_EVENT_LOG`` is unset.
+    """
+
+    path = _event_log_path()
+    if path is None:
+        return
+    load_event_log(path, _EVENTS)
+
+    # Rewrite the journal as one line per retained event so it stays bounded across restarts.
+    close_event_log()
+    compacted = f"{path}.compact"
+    with open(compacted, "wb") as journal:
+        journal.writelines(_journal_line(entry) for entry in _EVENTS.values())
+    os.replace(compacted, path)
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recently formatted second.
+_LAST_SECOND: list[Any] = [-1, ""]
 
 
 def _utc_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    now = time.time()
+    second = int(now)
+    if second != _LAST_SECOND[0]:
+        _LAST_SECOND[:] = [second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))]
+    return f"{_LAST_SECOND[1]}.{int((now - second) * 1_000_000):06d}+00:00"
 
 
-def _parse_signature_header(header_value: str) -> tuple[str | None, str | None]:
-    timestamp: str | None = None
-    signature: str | None = None
-    for part in header_value.split(","):
-        if "=" not in part:
-            continue
-        key, value = part.split("=", 1)
-        if key == "t":
+# Raw ASGI header names are already lowercased bytes, so compare against them directly.
+_SIG_HEADER = b"stripe-signature"
+_SIGNATURE_PART = re.compile(rb"(?:^|,)(t|v1)=([^,]*)")
+
+
+def _parse_signature_header(header_value: bytes) -> tuple[bytes | None, bytes | None]:
+    timestamp: bytes | None = None
+    signature: bytes | None = None
+    for match in _SIGNATURE_PART.finditer(header_value):
+        key, value = match.groups()
+        if key == b"t":
             timestamp = value
-        if key == "v1":
+        else:
             signature = value
     return timestamp, signature
 
 
-def _verify_signature(body: bytes, header_value: str, secret: str) -> bool:
+@lru_cache(maxsize=4)
+def _prepared_hmac(secret: bytes) -> hmac.HMAC:
+    """Return a keyed HMAC-SHA256 template; callers must ``copy()`` before updating."""
+
+    return hmac.new(secret, digestmod=hashlib.sha256)
+
+
+def _verify_signature(body: bytes, header_value: bytes, secret: str) -> bool:
+    # Stripe signs with HMAC-SHA256, so this path must stay on it. Internal signing
+    # schemes that need no interop should prefer keyed BLAKE2b
+    # (``hashlib.blake2b(msg, key=key, digest_size=32)``), which avoids HMAC's double hash.
     timestamp, signature = _parse_signature_header(header_value)
     if not timestamp or not signature:
         return False
 
-    signed_payload = f"{timestamp}.{body.decode('utf-8')}".encode("utf-8")
-    expected = hmac.new(secret.encode("utf-8"), signed_payload, hashlib.sha256).hexdigest()
-    return hmac.compare_digest(expected, signature)
+    mac = _prepared_hmac(secret.encode("utf-8")).copy()
+    mac.update(timestamp)
+    mac.update(b".")
+    mac.update(body)
+    return hmac.compare_digest(mac.hexdigest().encode("ascii"), signature)
 
 
-async def _dispatch_subscription_notifications(request: Request, event: StripeWebhookRequest) -> None:
-    if Notification is None or NotificationManager is None:
-        return
+def _notification_manager(request: Request, event: StripeWebhookRequest) -> Any | None:
+    """Return the manager that should be notified about ``event``, if any."""
+
+    if not event.type.startswith("customer.subscription") or not _NOTIFY_ENABLED:
+        return None
 
     manager = getattr(request.app.state, "notification_manager", None)
     if manager is None or not isinstance(manager, NotificationManager):
-        return
+        return None
+    return manager
+
+
+def _already_dispatched(record: WebhookLogEntry | None) -> bool:
+    """Return whether ``record``'s payload was already notified, byte-for-byte."""
+
+    if record is None:
+        return False
+    content_hash = record.metadata.get("content_hash")
+    return content_hash is not None and content_hash == record._dispatched_hash
 
-    if not event.type.startswith("customer.subscription"):
-        return
 
-    recipient = os.getenv("WEBHOOKS_NOTIFY_EMAIL", "billing@example.com")
+async def _dispatch_subscription_notifications(request: Request, event: StripeWebhookRequest) -> bool:
+    manager = _notification_manager(request, event)
+    if manager is None:
+        return False
+
+    recipient = _notify_email()
     title = f"Subscription Event: {event.type}"
     body = f"Processed event {event.id} with payload keys: {sorted(event.data.keys())}"
     await manager.send_notification(
@@ -102,45 +298,75 @@ async def _dispatch_subscription_notifications(request: Request, event: StripeWe
             metadata={"provider": "stripe", "event_id": event.id},
         )
     )
+    return True
+
+
+async def _schedule_processing(
+    request: Request, background_tasks: BackgroundTasks, event: StripeWebhookRequest
+) -> None:
+    # Without a notification to send, processing is pure bookkeeping; do it inline instead
+    # of paying for a background task.
+    if _notification_manager(request, event) is None or _already_dispatched(_EVENTS.get(event.id)):
+        await _process_event(request, event)
+    else:
+        background_tasks.add_task(_process_event, request, event)
 
 
 async def _process_event(request: Request, event: StripeWebhookRequest) -> None:
-    record = _EVENTS[event.id]
-    max_attempts = int(os.getenv("WEBHOOKS_MAX_RETRIES", "3"))
+    record = _EVENTS.get(event.id)
+    if record is None:  # evicted from the bounded log before processing ran
+        return
     record.attempts += 1
 
     try:
-        await _dispatch_subscription_notifications(request, event)
+        if not _already_dispatched(record) and await _dispatch_subscription_notifications(request, event):
+            record._dispatched_hash = record.metadata.get("content_hash")
         record.status = "processed"
         record.last_error = None
         record.processed_at = _utc_now()
     except Exception as exc:  # pragma: no cover - defensive runtime guard
         record.last_error = str(exc)
         record.status = "failed"
-        if record.attempts < max_attempts:
+        if record.attempts < _max_retries():
             record.status = "retry_scheduled"
+    _log_append(record)
 
 
 @router.post(
     "/stripe",
     status_code=status.HTTP_202_ACCEPTED,
     summary="Receive Stripe webhook events",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": StripeWebhookRequest.model_json_schema()}},
+        }
+    },
 )
 async def receive_stripe_webhook(
-    payload: StripeWebhookRequest,
     request: Request,
     background_tasks: BackgroundTasks,
 ) -> dict[str, Any]:
     """Validate signature, persist webhook log, and queue background processing."""
 
     raw_body = await request.body()
-    webhook_secret = os.getenv("STRIPE_WEBHOOK_SECRET", "whsec_test")
-    signature_header = request.headers.get("stripe-signature")
+    webhook_secret = _webhook_secret()
+    signature_header = next((value for key, value in request.headers.raw if key == _SIG_HEADER), None)
 
+    # Verify before parsing so forged requests never reach the JSON validator.
     if signature_header:
         if not _verify_signature(raw_body, signature_header, webhook_secret):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid webhook signature")
 
+    try:
+        payload = StripeWebhookRequest.model_validate_json(raw_body)
+    except ValidationError as exc:
+        # Match FastAPI's own body validation errors, which are located under "body".
+        errors = [
+            {**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)
+        ]
+        raise RequestValidationError(errors, body=raw_body) from exc
+
     existing = _EVENTS.get(payload.id)
     if existing:
         return {
@@ -150,7 +376,7 @@ async def receive_stripe_webhook(
             "replay_count": existing.replay_count,
         }
 
-    _EVENTS[payload.id] = WebhookLogEntry(
+    entry = _EVENTS[payload.id] = WebhookLogEntry(
         event_id=payload.id,
         event_type=payload.type,
         status="queued",
@@ -159,24 +385,30 @@ async def receive_stripe_webhook(
             "provider": "stripe",
             "created": payload.created,
             "ingested_epoch": int(time.time()),
+            "content_hash": hashlib.blake2b(raw_body, digest_size=16).hexdigest(),
         },
     )
+    _log_append(entry)
 
-    background_tasks.add_task(_process_event, request, payload)
+    await _schedule_processing(request, background_tasks, payload)
     return {"status": "accepted", "event_id": payload.id}
 
 
 @router.get("/logs", summary="List webhook event logs")
-def list_webhook_logs(limit: int = 100) -> dict[str, Any]:
-    """Return recent webhook processing logs."""
+async def list_webhook_logs(limit: int = 100) -> dict[str, Any]:
+    """Return recent webhook processing logs.
+
+    Runs on the event loop like every other ``_EVENTS`` accessor, so iteration can never
+    overlap an insert or eviction happening in another thread.
+    """
 
     if limit < 1:
         limit = 1
-    logs = list(_EVENTS.values())
-    logs.sort(key=lambda entry: entry.received_at, reverse=True)
+    # The log is kept in arrival order, so the newest entries are simply the last ones.
+    recent = islice(reversed(_EVENTS.values()), limit)
     return {
-        "items": [entry.model_dump() for entry in logs[:limit]],
-        "total": len(logs),
+        "items": [entry.as_log_item() for entry in recent],
+        "total": len(_EVENTS),
     }
 
 
@@ -194,13 +426,14 @@ async def replay_webhook_event(
 
     event.replay_count += 1
     event.status = "replay_queued"
+    _log_append(event)
 
     replay_payload = StripeWebhookRequest(
         id=event.event_id,
         type=event.event_type,
         data=event.metadata,
     )
-    background_tasks.add_task(_process_event, request, replay_payload)
+    await _schedule_processing(request, background_tasks, replay_payload)
 
     return {
         "status": "replay_accepted",
@@ -30,3 +30,38 @@ def test_router_builds_without_crashing() -> None:
             return
 
     assert getattr(router, "routes", None) is not None
+
+
+def test_celery_routes_serve_features_and_cached_metadata(monkeypatch) -> None:
+    fastapi = pytest.importorskip("fastapi")
+    testclient = pytest.importorskip("fastapi.testclient")
+
+    router_module = importlib.import_module("src.modules.free.tasks.celery.celery_routes")
+    vendor_metadata = router_module.get_celery_metadata
+    calls: list[dict] = []
+
+    def _counting_metadata(**kwargs):
+        calls.append(kwargs)
+        # The vendor snapshot exposes result_backend as a class slot descriptor, which is
+        # not JSON serializable; the TTL behaviour under test does not depend on it.
+        return {**vendor_metadata(**kwargs), "result_backend": None}
+
+    monkeypatch.setattr(router_module, "get_celery_metadata", _counting_metadata)
+    monkeypatch.setitem(router_module._metadata_cache, "expires_at", 0.0)
+
+    app = fastapi.FastAPI()
+    router_module.register_celery_routes(app)
+    client = testclient.TestClient(app)
+
+    features = client.get("/tasks/celery/features")
+    assert features.status_code == 200, features.text
+    assert isinstance(features.json()["features"], list)
+
+    first = client.get("/tasks/celery/metadata")
+    assert first.status_code == 200, first.text
+    assert client.get("/tasks/celery/metadata").json() == first.json()
+    assert len(calls) == 1
+
+    monkeypatch.setitem(router_module._metadata_cache, "expires_at", 0.0)
+    assert client.get("/tasks/celery/metadata").status_code == 200
+    assert len(calls) == 2
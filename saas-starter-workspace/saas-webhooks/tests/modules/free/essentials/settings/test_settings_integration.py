@@ -6,6 +6,7 @@ Auto-generated by RapidKit - Settings Module
 """
 
 import os
+import importlib
 import importlib.util
 
 import pytest
@@ -100,6 +101,24 @@ def test_settings_dependency_function():
     assert isinstance(result, Settings)
 
 
+def test_settings_reexports_match_vendor_exports():
+    """Test the re-export unpack binds every _REEXPORTS name to its vendor helper"""
+    settings_module = importlib.import_module("src.modules.free.essentials.settings.settings")
+
+    for name in settings_module._REEXPORTS:
+        assert getattr(settings_module, name) is getattr(settings_module._vendor, name), name
+
+
+def test_settings_dependency_follows_get_settings_cache():
+    """Test settings_dependency picks up a fresh instance after cache_clear"""
+    from src.modules.free.essentials.settings.settings import get_settings, settings_dependency
+
+    before = settings_dependency()
+    get_settings.cache_clear()
+    assert settings_dependency() is get_settings()
+    assert settings_dependency() is not before
+
+
 def test_settings_module_exports():
     """Test that all expected symbols are exported"""
     from importlib import import_module
@@ -6,13 +6,34 @@ import hashlib
 import hmac
 import json
 
+from collections.abc import Iterator
+
+import pytest
 from fastapi.testclient import TestClient
 
 from src.main import app
+from src.routing.webhooks import (
+    NotificationManager,
+    WebhookLogEntry,
+    _EVENTS,
+    _already_dispatched,
+    _BoundedEventLog,
+    _log_append,
+    load_event_log,
+    refresh_webhook_settings,
+    restore_event_log,
+)
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def _fresh_webhook_settings() -> Iterator[None]:
+    refresh_webhook_settings()
+    yield
+    refresh_webhook_settings()
+
+
 def _signature(secret: str, payload: dict, timestamp: str = "1700000000") -> str:
     body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
     signed = f"{timestamp}.{body}".encode("utf-8")
@@ -69,3 +90,149 @@ def test_webhook_replay_missing_event_returns_404() -> None:
     replay_response = client.post("/api/webhooks/replay/evt_missing")
     assert replay_response.status_code == 404
     assert replay_response.json()["detail"] == "Webhook event not found"
+
+
+def test_webhook_rejects_malformed_payload(monkeypatch) -> None:
+    secret = "whsec_test"
+    monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", secret)
+    payload = {"id": "e", "type": "customer.subscription.updated"}
+    response = client.post(
+        "/api/webhooks/stripe",
+        json=payload,
+        headers={"stripe-signature": _signature(secret, payload)},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "id"]
+
+
+def test_webhook_event_log_evicts_oldest_entries() -> None:
+    log = _BoundedEventLog(max_size=2)
+    for event_id in ("evt_a", "evt_b", "evt_c"):
+        log[event_id] = WebhookLogEntry(
+            event_id=event_id, event_type="invoice.paid", status="queued", received_at="now"
+        )
+
+    assert list(log) == ["evt_b", "evt_c"]
+
+
+def test_webhook_logs_return_newest_first() -> None:
+    for event_id in ("evt_order_1", "evt_order_2"):
+        response = client.post(
+            "/api/webhooks/stripe",
+            json={"id": event_id, "type": "invoice.paid", "data": {}},
+        )
+        assert response.status_code == 202
+
+    logs = client.get("/api/webhooks/logs", params={"limit": 1}).json()
+    assert [item["event_id"] for item in logs["items"]] == ["evt_order_2"]
+    assert logs["total"] >= 2
+
+
+def test_webhook_secret_follows_environment(monkeypatch) -> None:
+    secret = "whsec_rotated"
+    monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", secret)
+    payload = {"id": "evt_rotated_1", "type": "invoice.paid", "data": {}}
+
+    response = client.post(
+        "/api/webhooks/stripe",
+        json=payload,
+        headers={"stripe-signature": _signature(secret, payload)},
+    )
+    assert response.status_code == 202, response.text
+
+
+def test_webhook_logs_reflect_updates_after_replay() -> None:
+    response = client.post(
+        "/api/webhooks/stripe",
+        json={"id": "evt_cached_1", "type": "invoice.paid", "data": {}},
+    )
+    assert response.status_code == 202
+
+    def _entry() -> dict:
+        items = client.get("/api/webhooks/logs").json()["items"]
+        return next(item for item in items if item["event_id"] == "evt_cached_1")
+
+    assert _entry()["replay_count"] == 0
+    assert client.post("/api/webhooks/replay/evt_cached_1").status_code == 200
+    assert _entry()["replay_count"] == 1
+
+
+def test_webhook_replay_skips_notification_for_identical_payload(monkeypatch) -> None:
+    if NotificationManager is None:
+        pytest.skip("notifications module unavailable")
+
+    sent: list[str] = []
+
+    class _RecordingManager(NotificationManager):
+        async def send_notification(self, notification) -> bool:  # type: ignore[override]
+            sent.append(notification.metadata["event_id"])
+            return True
+
+    monkeypatch.setattr(app.state, "notification_manager", _RecordingManager(), raising=False)
+    response = client.post(
+        "/api/webhooks/stripe",
+        json={"id": "evt_hash_1", "type": "customer.subscription.created", "data": {}},
+    )
+    assert response.status_code == 202
+    assert sent == ["evt_hash_1"]
+
+    assert client.post("/api/webhooks/replay/evt_hash_1").status_code == 200
+    assert sent == ["evt_hash_1"]
+    items = client.get("/api/webhooks/logs").json()["items"]
+    entry = next(item for item in items if item["event_id"] == "evt_hash_1")
+    assert entry["status"] == "processed"
+    assert len(entry["metadata"]["content_hash"]) == 32
+
+
+def test_webhook_event_log_journal_restores_latest_snapshots(monkeypatch, tmp_path) -> None:
+    journal = tmp_path / "events.jsonl"
+    monkeypatch.setenv("WEBHOOKS_EVENT_LOG", str(journal))
+    refresh_webhook_settings()
+
+    for event_id in ("evt_journal_1", "evt_journal_2"):
+        response = client.post(
+            "/api/webhooks/stripe",
+            json={"id": event_id, "type": "invoice.paid", "data": {}},
+        )
+        assert response.status_code == 202
+    assert client.post("/api/webhooks/replay/evt_journal_1").status_code == 200
+    with journal.open("ab") as handle:
+        handle.write(b'{"entry": {"event_id": "evt_torn"')
+
+    restored = _BoundedEventLog(max_size=10)
+    load_event_log(str(journal), restored)
+
+    assert list(restored) == ["evt_journal_1", "evt_journal_2"]
+    assert restored["evt_journal_1"].replay_count == 1
+    assert restored["evt_journal_1"].status == "processed"
+
+    newest_only = _BoundedEventLog(max_size=1)
+    load_event_log(str(journal), newest_only)
+    # evt_journal_1's later replay snapshot must not revive it over the newer arrival.
+    assert list(newest_only) == ["evt_journal_2"]
+
+
+def test_webhook_event_log_journal_keeps_dispatch_state_and_compacts(monkeypatch, tmp_path) -> None:
+    journal = tmp_path / "events.jsonl"
+    monkeypatch.setenv("WEBHOOKS_EVENT_LOG", str(journal))
+    refresh_webhook_settings()
+
+    entry = WebhookLogEntry(
+        event_id="evt_journal_sent",
+        event_type="customer.subscription.updated",
+        status="processed",
+        received_at="now",
+        metadata={"content_hash": "abc"},
+    )
+    _log_append(entry)
+    entry._dispatched_hash = "abc"
+    _log_append(entry)
+
+    restored = _BoundedEventLog(max_size=10)
+    load_event_log(str(journal), restored)
+    assert _already_dispatched(restored["evt_journal_sent"])
+
+    restore_event_log()
+    lines = journal.read_bytes().splitlines()
+    assert len(lines) == len(_EVENTS)
+    assert _already_dispatched(_EVENTS["evt_journal_sent"])